@@ -2,12 +2,13 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os
-import time
 from datetime import datetime
+from fetch import fetch, load_retry_queue, save_retry_queue, scrape_with_retry_queue
 
 BASE_URL = 'https://www.moore-bdr.sk/novinky/'
 OUTPUT_DIR = 'output'
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'articles.csv')
+RETRY_FILE = os.path.join(OUTPUT_DIR, 'retry_queue_bdr.json')
 
 HEADERS = {
     'User-Agent': (
@@ -23,14 +24,12 @@ HEADERS = {
 
 session = requests.Session()
 session.headers.update(HEADERS)
-session.get(BASE_URL)
 
 SOURCE_NAME = 'Moore BDR s.r.o.'
 
 def scrape_listing():
     """Fetches all article URLs and their publication dates from the novinky main page."""
-    resp = session.get(BASE_URL)
-    resp.raise_for_status()
+    resp = fetch(session, BASE_URL)
     soup = BeautifulSoup(resp.text, 'html.parser')
     articles = []
     for article in soup.find_all('article'):
@@ -59,8 +58,7 @@ def scrape_listing():
 
 def scrape_article(url):
     """Fetches title and content from an individual article page."""
-    resp = session.get(url)
-    resp.raise_for_status()
+    resp = fetch(session, url)
     soup = BeautifulSoup(resp.text, 'html.parser')
     title_tag = soup.find('h1')
     title = title_tag.get_text(strip=True) if title_tag else ''
@@ -94,23 +92,35 @@ def main():
     seen_urls = set(existing_df['url'])
     new_records = []
 
-    articles = scrape_listing()
-    for url, post_date in articles:
-        if url in seen_urls:
-            continue
-        try:
-            title, content = scrape_article(url)
-            if title and content:
-                new_records.append({
-                    'title': title,
-                    'content': content,
-                    'post_date': post_date,
-                    'url': url,
-                    'source': SOURCE_NAME
-                })
-        except Exception as e:
-            print(f"Error scraping {url}: {e}")
-        time.sleep(1)
+    def process(entry):
+        url = entry['url']
+        title, content = scrape_article(url)
+        if title and content:
+            new_records.append({
+                'title': title,
+                'content': content,
+                'post_date': entry.get('post_date', ''),
+                'url': url,
+                'source': SOURCE_NAME
+            })
+
+    # Warm up session to get cookies
+    try:
+        fetch(session, BASE_URL)
+    except Exception as e:
+        print(f"Error warming up session: {e}")
+
+    try:
+        articles = scrape_listing()
+    except Exception as e:
+        print(f"Error scraping listing: {e}")
+        articles = []
+    listed = [{'url': url, 'post_date': post_date} for url, post_date in articles]
+    failed = scrape_with_retry_queue(
+        listed, load_retry_queue(RETRY_FILE), process, seen_urls)
+    queued_count = save_retry_queue(RETRY_FILE, failed)
+    if queued_count:
+        print(f"Queued {queued_count} articles for retry.")
 
     if new_records:
         df_new = pd.DataFrame(new_records)
@@ -2,12 +2,13 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os
-import time
 import re
+from fetch import fetch, load_retry_queue, save_retry_queue, scrape_with_retry_queue
 
 BASE_URL = 'https://moorepolska.pl/artykuly/?jsf=jet-engine&tax=category:31&pagenum='
 OUTPUT_DIR = 'output'
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'articles.csv')
+RETRY_FILE = os.path.join(OUTPUT_DIR, 'retry_queue_pl.json')
 
 HEADERS = {
     'User-Agent': (
@@ -33,8 +34,7 @@ session.headers.update(HEADERS)
 
 def scrape_listing(page):
     url = f"{BASE_URL}{page}"
-    resp = session.get(url)
-    resp.raise_for_status()
+    resp = fetch(session, url)
     soup = BeautifulSoup(resp.text, 'html.parser')
     articles = []
     for div in soup.select('div.jet-listing-grid__item'):
@@ -53,8 +53,7 @@ def parse_polish_date(text):
     return ''
 
 def scrape_article(url):
-    resp = session.get(url)
-    resp.raise_for_status()
+    resp = fetch(session, url)
     soup = BeautifulSoup(resp.text, 'html.parser')
     # Title
     title_tag = soup.find('h1')
@@ -100,34 +99,45 @@ def load_existing():
             return pd.DataFrame(columns=cols)
     return pd.DataFrame(columns=cols)
 
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    existing_df = load_existing()
-    seen_urls = set(existing_df['url'])
-    new_records = []
+def list_articles():
+    """Yields listing entries page by page; a failing page ends the crawl."""
     page = 1
     while True:
-        urls = scrape_listing(page)
+        try:
+            urls = scrape_listing(page)
+        except Exception as e:
+            print(f"Error scraping listing page {page}: {e}")
+            return
         if not urls:
-            break
+            return
         for url in urls:
-            if url in seen_urls:
-                continue
-            try:
-                title, content, post_date = scrape_article(url)
-                if title and content:
-                    new_records.append({
-                        'title': title,
-                        'content': content,
-                        'post_date': post_date,
-                        'url': url,
-                        'source': SOURCE_NAME
-                    })
-            except Exception as e:
-                print(f"Error scraping {url}: {e}")
-            time.sleep(1)
+            yield {'url': url}
         page += 1
 
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    existing_df = load_existing()
+    seen_urls = set(existing_df['url'])
+    new_records = []
+
+    def process(entry):
+        url = entry['url']
+        title, content, post_date = scrape_article(url)
+        if title and content:
+            new_records.append({
+                'title': title,
+                'content': content,
+                'post_date': post_date,
+                'url': url,
+                'source': SOURCE_NAME
+            })
+
+    failed = scrape_with_retry_queue(
+        list_articles(), load_retry_queue(RETRY_FILE), process, seen_urls)
+    queued_count = save_retry_queue(RETRY_FILE, failed)
+    if queued_count:
+        print(f"Queued {queued_count} articles for retry.")
+
     if new_records:
         df_new = pd.DataFrame(new_records)
         updated_df = pd.concat([existing_df, df_new], ignore_index=True)
@@ -0,0 +1,129 @@
+import argparse
+import io
+import re
+import time
+import tracemalloc
+
+import final_html
+
+PARAGRAPH = 'Moore <Global> & partners reported "strong" growth.\nSecond line.\n\n'
+
+
+def make_rows(n):
+    for i in range(n):
+        row = {
+            'post_date': '2025-01-16',
+            'url': f'https://example.com/article?id={i}&lang=en',
+            'source': 'Moore Czech Republic s.r.o.',
+        }
+        for lang in final_html.LANGS:
+            row[f'title_{lang}'] = f'Article {i} <{lang}>'
+            row[f'content_{lang}'] = PARAGRAPH * 20
+        yield row
+
+
+class CountingWriter(io.TextIOBase):
+    """Discards output but counts characters, so the benchmark measures rendering only."""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, s):
+        self.chars += len(s)
+        return len(s)
+
+
+def baseline_add_line_breaks(text):
+    if not text:
+        return ''
+    text = re.sub(r'\r?\n\r?\n+', '<br><br>', text)
+    text = re.sub(r'\r?\n', '<br>', text)
+    return text
+
+
+def baseline_make_card(row, idx):
+    # The renderer before streaming/escaping, kept for comparison
+    post_date_fmt = final_html.format_date(row['post_date'])
+    title_html = []
+    for lang in final_html.LANGS:
+        title = row.get(f'title_{lang}', '')
+        display = '' if lang == 'eng' else 'none'
+        title_html.append(f'<h2 id="title_{lang}_{idx}" style="display:{display};">{title}</h2>')
+    summary_html = []
+    for lang in final_html.LANGS:
+        content = row.get(f'content_{lang}', '')
+        preview_html = baseline_add_line_breaks(content[:200])
+        display = '' if lang == 'eng' else 'none'
+        summary_html.append(f'<p class="summary" id="summary_{lang}_{idx}" style="display:{display};">{preview_html}</p>')
+    full_html = []
+    for lang in final_html.LANGS:
+        content_html = baseline_add_line_breaks(row.get(f'content_{lang}', ''))
+        full_html.append(f'<p class="full-content" id="full_{lang}_{idx}" style="display:none;">{content_html}</p>')
+    return f'''
+    <div class="card" data-idx="{idx}">
+      {''.join(title_html)}
+      <p class="date">{post_date_fmt}</p>
+      <hr/>
+      {''.join(summary_html)}
+      {''.join(full_html)}
+      <p class="source">
+        Source: <a href="{row['url']}" target="_blank">{row['source']}</a>
+      </p>
+      <button class="btn"
+        onclick="toggleFullContent({idx}, this)">
+        Read full article
+      </button>
+    </div>
+    '''
+
+
+def baseline_write_html(rows, out):
+    # Collects every card in a list before joining, as the old main() did
+    cards = []
+    for idx, row in enumerate(rows):
+        cards.append(baseline_make_card(row, idx))
+    out.write(final_html.header)
+    out.write('\n'.join(cards))
+    out.write(final_html.footer)
+
+
+RENDERERS = [
+    ('baseline', baseline_write_html),
+    ('streaming', final_html.write_html),
+]
+
+
+def measure_speed(render, rows):
+    out = CountingWriter()
+    start = time.perf_counter()
+    render(make_rows(rows), out)
+    return time.perf_counter() - start, out.chars
+
+
+def measure_peak(render, rows):
+    tracemalloc.start()
+    try:
+        render(make_rows(rows), CountingWriter())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark final_html card rendering.')
+    parser.add_argument('--rows', type=int, default=10000, help='number of synthetic rows to render')
+    args = parser.parse_args()
+
+    print(f"Rendering {args.rows} cards")
+    for name, render in RENDERERS:
+        # Time with tracemalloc off; its hooks slow allocation-heavy code several-fold
+        elapsed, chars = measure_speed(render, args.rows)
+        print(f"{name:>9} [timed, tracemalloc off]: {elapsed:.2f}s, "
+              f"{args.rows / elapsed:,.0f} cards/sec, {chars / 1e6:.1f}M chars")
+        peak = measure_peak(render, args.rows)
+        print(f"{name:>9} [traced, separate run]: peak {peak / 1024:,.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+import json
+import math
+import os
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Consecutive failed fetches (each after its own retries) before a host is skipped
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 300
+
+# Runs a queued article is retried on before it is dropped
+MAX_QUEUE_ATTEMPTS = 3
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised when a host has failed too often and is temporarily skipped."""
+
+
+class CircuitBreaker:
+    """Per-host breaker: opens after consecutive failures, half-opens after a cooldown."""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = {}
+        self.opened_at = {}
+
+    def allow(self, host):
+        opened = self.opened_at.get(host)
+        if opened is None:
+            return True
+        if time.monotonic() - opened >= self.cooldown:
+            # Cooldown over: allow requests again, but the first failure re-opens
+            del self.opened_at[host]
+            self.failures[host] = self.threshold - 1
+            return True
+        return False
+
+    def is_open(self, host):
+        opened = self.opened_at.get(host)
+        return opened is not None and time.monotonic() - opened < self.cooldown
+
+    def record_success(self, host):
+        self.failures.pop(host, None)
+        self.opened_at.pop(host, None)
+
+    def record_failure(self, host):
+        self.failures[host] = self.failures.get(host, 0) + 1
+        if self.failures[host] >= self.threshold:
+            self.opened_at[host] = time.monotonic()
+            print(f"[fetch] Circuit open for {host} after {self.failures[host]} failures")
+
+
+breaker = CircuitBreaker()
+
+
+def backoff_delay(attempt):
+    # Full jitter: uniform in [0, base * 2^attempt], capped
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def retry_after_delay(resp):
+    value = resp.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        delay = float(value)
+        if not math.isfinite(delay):
+            return None
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        delay = (dt - datetime.now(timezone.utc)).total_seconds()
+    return max(delay, 0.0)
+
+
+def fetch(session, url, retries=MAX_RETRIES):
+    """GET a URL with timeouts, retries with backoff, Retry-After and circuit breaking."""
+    host = urlsplit(url).netloc
+    if not breaker.allow(host):
+        raise CircuitOpenError(f"circuit open for {host}")
+    for attempt in range(retries + 1):
+        try:
+            resp = session.get(url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == retries:
+                breaker.record_failure(host)
+                raise
+            delay = backoff_delay(attempt)
+            print(f"[fetch] {url}: {e}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        if resp.status_code in RETRY_STATUSES:
+            delay = retry_after_delay(resp)
+            # Give up rather than retry before the server asked us to
+            if attempt == retries or (delay is not None and delay > BACKOFF_MAX):
+                breaker.record_failure(host)
+                resp.raise_for_status()
+            if delay is None:
+                delay = backoff_delay(attempt)
+            print(f"[fetch] {url}: HTTP {resp.status_code}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        # Other 4xx are permanent; they say nothing about host health
+        resp.raise_for_status()
+        breaker.record_success(host)
+        return resp
+
+
+def load_retry_queue(path):
+    """Returns the list of queued entries (dicts with at least a 'url' key)."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[fetch] Could not read retry queue {path}: {e}")
+        return []
+    return [e for e in entries if isinstance(e, dict) and e.get('url')]
+
+
+def save_retry_queue(path, entries):
+    # Deduplicate by url, keeping the first entry; drop entries out of attempts
+    seen = set()
+    unique = []
+    for entry in entries:
+        if entry['url'] in seen:
+            continue
+        seen.add(entry['url'])
+        if entry.get('attempts', 0) >= MAX_QUEUE_ATTEMPTS:
+            print(f"[fetch] Giving up on {entry['url']} after {entry['attempts']} runs")
+            continue
+        unique.append(entry)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(unique, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return len(unique)
+
+
+def is_transient(exc):
+    """True if a failed fetch is worth retrying on a later run."""
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code in RETRY_STATUSES
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout, CircuitOpenError))
+
+
+def circuit_open(url):
+    """True if the breaker is currently skipping the URL's host."""
+    return breaker.is_open(urlsplit(url).netloc)
+
+
+def scrape_with_retry_queue(listed, queued, process, seen_urls, delay=1):
+    """Scrapes freshly listed entries, then queued ones; returns the entries to queue again.
+
+    Entries are dicts with a 'url' key; process(entry) scrapes one and raises on
+    failure. Listed URLs that are already queued are skipped so they keep their
+    attempt count. Transient failures come back with 'attempts' incremented, and
+    once the host's circuit is open the remaining queued entries are carried over
+    unchanged.
+    """
+    failed = []
+    queued_urls = {entry['url'] for entry in queued}
+
+    def attempt(entry):
+        try:
+            process(entry)
+        except Exception as e:
+            print(f"Error scraping {entry['url']}: {e}")
+            if is_transient(e):
+                failed.append({**entry, 'attempts': entry.get('attempts', 0) + 1})
+        seen_urls.add(entry['url'])
+        time.sleep(delay)
+
+    for entry in listed:
+        if entry['url'] in seen_urls or entry['url'] in queued_urls:
+            continue
+        attempt(entry)
+    for entry in queued:
+        if entry['url'] in seen_urls:
+            continue
+        if circuit_open(entry['url']):
+            failed.append(entry)
+            continue
+        attempt(entry)
+    return failed
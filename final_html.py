@@ -1,4 +1,6 @@
 import csv
+import html
+import re
 from datetime import datetime
 
 header = """<!DOCTYPE html>
@@ -106,45 +108,24 @@ def format_date(date_str):
     except Exception:
         return date_str
 
-def add_line_breaks(text):
-    if not text:
-        return ''
-    import re
-    text = re.sub(r'\r?\n\r?\n+', '<br><br>', text)
-    text = re.sub(r'\r?\n', '<br>', text)
-    return text
+LANGS = ['eng', 'jp', 'cn', 'kr']
+PREVIEW_CHARS = 200
 
-def make_card(row, idx):
-    post_date_fmt = format_date(row['post_date'])
-    # Titles
-    title_html = []
-    for lang in ['eng', 'jp', 'cn', 'kr']:
-        title = row.get(f'title_{lang}', '')
-        display = '' if lang == 'eng' else 'none'
-        title_html.append(f'<h2 id="title_{lang}_{idx}" style="display:{display};">{title}</h2>')
-    # Summaries
-    summary_html = []
-    for lang in ['eng', 'jp', 'cn', 'kr']:
-        content = row.get(f'content_{lang}', '')
-        preview = content[:200]
-        preview_html = add_line_breaks(preview)
-        display = '' if lang == 'eng' else 'none'
-        summary_html.append(f'<p class="summary" id="summary_{lang}_{idx}" style="display:{display};">{preview_html}</p>')
-    # Full content (hidden by default, toggled by button)
-    full_html = []
-    for lang in ['eng', 'jp', 'cn', 'kr']:
-        content = row.get(f'content_{lang}', '')
-        content_html = add_line_breaks(content)
-        full_html.append(f'<p class="full-content" id="full_{lang}_{idx}" style="display:none;">{content_html}</p>')
-    return f'''
+PARAGRAPH_BREAK_RE = re.compile(r'\r?\n\r?\n+')
+LINE_BREAK_RE = re.compile(r'\r?\n')
+
+TITLE_TEMPLATE = '<h2 id="title_{lang}_{idx}" style="display:{display};">{text}</h2>'
+SUMMARY_TEMPLATE = '<p class="summary" id="summary_{lang}_{idx}" style="display:{display};">{text}</p>'
+FULL_TEMPLATE = '<p class="full-content" id="full_{lang}_{idx}" style="display:none;">{text}</p>'
+CARD_TEMPLATE = '''
     <div class="card" data-idx="{idx}">
-      {''.join(title_html)}
-      <p class="date">{post_date_fmt}</p>
+      {titles}
+      <p class="date">{date}</p>
       <hr/>
-      {''.join(summary_html)}
-      {''.join(full_html)}
+      {summaries}
+      {full}
       <p class="source">
-        Source: <a href="{row['url']}" target="_blank">{row['source']}</a>
+        Source: <a href="{url}" target="_blank">{source}</a>
       </p>
       <button class="btn"
         onclick="toggleFullContent({idx}, this)">
@@ -153,16 +134,64 @@ def make_card(row, idx):
     </div>
     '''
 
+def add_line_breaks(text):
+    """Escapes text for HTML and turns newlines into <br> tags."""
+    if not text:
+        return ''
+    text = html.escape(text)
+    if '\r' in text:
+        text = PARAGRAPH_BREAK_RE.sub('<br><br>', text)
+        return LINE_BREAK_RE.sub('<br>', text)
+    # Same result as the regexes for \n-only text, at str.replace speed
+    while '\n\n\n' in text:
+        text = text.replace('\n\n\n', '\n\n')
+    return text.replace('\n\n', '<br><br>').replace('\n', '<br>')
+
+def make_card(row, idx):
+    post_date_fmt = html.escape(format_date(row.get('post_date') or ''))
+    titles = []
+    summaries = []
+    full = []
+    for lang in LANGS:
+        display = '' if lang == 'eng' else 'none'
+        title = row.get(f'title_{lang}') or ''
+        content = row.get(f'content_{lang}') or ''
+        titles.append(TITLE_TEMPLATE.format(
+            lang=lang, idx=idx, display=display, text=html.escape(title)))
+        content_html = add_line_breaks(content)
+        # Slice before escaping so the preview never cuts an entity in half
+        preview_html = (content_html if len(content) <= PREVIEW_CHARS
+                        else add_line_breaks(content[:PREVIEW_CHARS]))
+        summaries.append(SUMMARY_TEMPLATE.format(
+            lang=lang, idx=idx, display=display, text=preview_html))
+        full.append(FULL_TEMPLATE.format(lang=lang, idx=idx, text=content_html))
+    return CARD_TEMPLATE.format(
+        idx=idx,
+        titles=''.join(titles),
+        date=post_date_fmt,
+        summaries=''.join(summaries),
+        full=''.join(full),
+        url=html.escape(row.get('url') or ''),
+        source=html.escape(row.get('source') or ''),
+    )
+
+def render_cards(rows):
+    """Yields one rendered card per row, so callers never hold the whole page in memory."""
+    for idx, row in enumerate(rows):
+        yield make_card(row, idx)
+
+def write_html(rows, out):
+    out.write(header)
+    for i, card in enumerate(render_cards(rows)):
+        if i:
+            out.write('\n')
+        out.write(card)
+    out.write(footer)
+
 def main():
-    with open('output/final.csv', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        cards = []
-        for idx, row in enumerate(reader):
-            cards.append(make_card(row, idx))
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(header)
-        f.write('\n'.join(cards))
-        f.write(footer)
+    with open('output/final.csv', encoding='utf-8') as f_in, \
+            open('index.html', 'w', encoding='utf-8') as f_out:
+        write_html(csv.DictReader(f_in), f_out)
 
 if __name__ == "__main__":
     main()
@@ -2,11 +2,12 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os
-import time
+from fetch import fetch, load_retry_queue, save_retry_queue, scrape_with_retry_queue
 
 BASE_URL = 'https://www.moore-czech.cz/tiskove-zpravy'
 OUTPUT_DIR = 'output'
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'articles.csv')
+RETRY_FILE = os.path.join(OUTPUT_DIR, 'retry_queue_cz.json')
 
 # Browser-like headers
 HEADERS = {
@@ -23,8 +24,6 @@ HEADERS = {
 
 session = requests.Session()
 session.headers.update(HEADERS)
-# Warm up session to get cookies
-session.get(BASE_URL)
 
 CZECH_MONTHS = {
     'ledna': '01', 'února': '02', 'března': '03', 'dubna': '04',
@@ -37,8 +36,7 @@ SOURCE_NAME = 'Moore Czech Republic s.r.o.'
 
 def scrape_listing(page):
     url = f"{BASE_URL}?page={page}"
-    resp = session.get(url)
-    resp.raise_for_status()
+    resp = fetch(session, url)
     soup = BeautifulSoup(resp.text, 'html.parser')
     # Article links under <h5><a>
     return [requests.compat.urljoin(BASE_URL, a['href'])
@@ -46,8 +44,7 @@ def scrape_listing(page):
 
 
 def scrape_article(url):
-    resp = session.get(url)
-    resp.raise_for_status()
+    resp = fetch(session, url)
     soup = BeautifulSoup(resp.text, 'html.parser')
     # Title: h1 or fallback h2
     title_tag = soup.find('h1') or soup.find('h2')
@@ -93,34 +90,52 @@ def load_existing():
     return pd.DataFrame(columns=cols)
 
 
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    existing_df = load_existing()
-    seen_urls = set(existing_df['url'])
-    new_records = []
+def list_articles():
+    """Yields listing entries page by page; a failing page ends the crawl."""
     page = 1
     while True:
-        urls = scrape_listing(page)
+        try:
+            urls = scrape_listing(page)
+        except Exception as e:
+            print(f"Error scraping listing page {page}: {e}")
+            return
         if not urls:
-            break
+            return
         for url in urls:
-            if url in seen_urls:
-                continue
-            try:
-                title, content, post_date = scrape_article(url)
-                if title and content:
-                    new_records.append({
-                        'title': title,
-                        'content': content,
-                        'post_date': post_date,
-                        'url': url,
-                        'source': SOURCE_NAME
-                    })
-            except Exception as e:
-                print(f"Error scraping {url}: {e}")
-            time.sleep(1)
+            yield {'url': url}
         page += 1
 
+
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    existing_df = load_existing()
+    seen_urls = set(existing_df['url'])
+    new_records = []
+
+    def process(entry):
+        url = entry['url']
+        title, content, post_date = scrape_article(url)
+        if title and content:
+            new_records.append({
+                'title': title,
+                'content': content,
+                'post_date': post_date,
+                'url': url,
+                'source': SOURCE_NAME
+            })
+
+    # Warm up session to get cookies
+    try:
+        fetch(session, BASE_URL)
+    except Exception as e:
+        print(f"Error warming up session: {e}")
+
+    failed = scrape_with_retry_queue(
+        list_articles(), load_retry_queue(RETRY_FILE), process, seen_urls)
+    queued_count = save_retry_queue(RETRY_FILE, failed)
+    if queued_count:
+        print(f"Queued {queued_count} articles for retry.")
+
     if new_records:
         df_new = pd.DataFrame(new_records)
         updated_df = pd.concat([existing_df, df_new], ignore_index=True)
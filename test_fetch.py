@@ -0,0 +1,205 @@
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+import pytest
+import requests
+
+import fetch
+
+
+def make_response(status, headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    resp.url = 'https://h/'
+    return resp
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker(monkeypatch):
+    monkeypatch.setattr(fetch, 'breaker', fetch.CircuitBreaker())
+    monkeypatch.setattr(fetch.time, 'sleep', lambda s: None)
+
+
+def session_returning(*responses):
+    session = mock.Mock()
+    session.get.side_effect = list(responses)
+    return session
+
+
+def test_retries_then_succeeds():
+    session = session_returning(make_response(503), requests.Timeout('t'), make_response(200))
+    assert fetch.fetch(session, 'https://h/a').status_code == 200
+    assert session.get.call_count == 3
+    assert not fetch.circuit_open('https://h/a')
+
+
+def test_one_bad_url_does_not_open_circuit():
+    session = mock.Mock()
+    session.get.return_value = make_response(500)
+    with pytest.raises(requests.HTTPError):
+        fetch.fetch(session, 'https://h/bad')
+    assert session.get.call_count == fetch.MAX_RETRIES + 1
+    assert not fetch.circuit_open('https://h/other')
+    session.get.return_value = make_response(200)
+    assert fetch.fetch(session, 'https://h/listing').status_code == 200
+
+
+def test_many_bad_urls_open_circuit():
+    session = mock.Mock()
+    session.get.return_value = make_response(500)
+    for i in range(fetch.BREAKER_THRESHOLD):
+        with pytest.raises(requests.HTTPError):
+            fetch.fetch(session, f'https://h/bad{i}')
+    assert fetch.circuit_open('https://h/next')
+    with pytest.raises(fetch.CircuitOpenError):
+        fetch.fetch(session, 'https://h/next')
+    # Other hosts are unaffected
+    assert not fetch.circuit_open('https://other/')
+
+
+def test_success_resets_failure_count():
+    session = mock.Mock()
+    for i in range(fetch.BREAKER_THRESHOLD * 2):
+        session.get.return_value = make_response(500)
+        with pytest.raises(requests.HTTPError):
+            fetch.fetch(session, f'https://h/bad{i}', retries=0)
+        session.get.return_value = make_response(200)
+        fetch.fetch(session, 'https://h/ok')
+    assert not fetch.circuit_open('https://h/')
+
+
+def test_half_open_after_cooldown(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(fetch.time, 'monotonic', lambda: now[0])
+    breaker = fetch.breaker
+    for _ in range(fetch.BREAKER_THRESHOLD):
+        breaker.record_failure('h')
+    assert not breaker.allow('h')
+    now[0] += fetch.BREAKER_COOLDOWN
+    assert breaker.allow('h')
+    # After the cooldown, the first failure re-opens the circuit
+    breaker.record_failure('h')
+    assert breaker.is_open('h')
+
+
+def test_retry_after_seconds_and_date():
+    assert fetch.retry_after_delay(make_response(503, {'Retry-After': '7'})) == 7.0
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = fetch.retry_after_delay(make_response(503, {'Retry-After': format_datetime(future, usegmt=True)}))
+    assert 25 < delay <= 30
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert fetch.retry_after_delay(make_response(503, {'Retry-After': format_datetime(past, usegmt=True)})) == 0.0
+    assert fetch.retry_after_delay(make_response(503, {'Retry-After': 'soon'})) is None
+    assert fetch.retry_after_delay(make_response(503, {'Retry-After': 'nan'})) is None
+    assert fetch.retry_after_delay(make_response(503, {'Retry-After': 'inf'})) is None
+    assert fetch.retry_after_delay(make_response(503)) is None
+
+
+def test_long_retry_after_gives_up_instead_of_retrying_early():
+    too_long = str(int(fetch.BACKOFF_MAX) + 1)
+    session = session_returning(make_response(429, {'Retry-After': too_long}), make_response(200))
+    with pytest.raises(requests.HTTPError) as excinfo:
+        fetch.fetch(session, 'https://h/a')
+    assert session.get.call_count == 1
+    assert fetch.is_transient(excinfo.value)
+    assert fetch.breaker.failures['h'] == 1
+
+
+@pytest.mark.parametrize('exc', [
+    requests.ConnectionError(),
+    requests.Timeout(),
+    fetch.CircuitOpenError(),
+    requests.HTTPError(response=make_response(503)),
+    requests.HTTPError(response=make_response(429)),
+])
+def test_transient_errors(exc):
+    assert fetch.is_transient(exc)
+
+
+@pytest.mark.parametrize('exc', [
+    requests.exceptions.MissingSchema(),
+    requests.exceptions.InvalidURL(),
+    requests.exceptions.InvalidSchema(),
+    requests.TooManyRedirects(),
+    requests.HTTPError(response=make_response(404)),
+    requests.HTTPError(),
+    ValueError(),
+])
+def test_permanent_errors(exc):
+    assert not fetch.is_transient(exc)
+
+
+def test_retry_queue_round_trip(tmp_path):
+    path = str(tmp_path / 'queue.json')
+    assert fetch.load_retry_queue(path) == []
+    saved = fetch.save_retry_queue(path, [
+        {'url': 'https://h/a', 'attempts': 1},
+        {'url': 'https://h/a', 'attempts': 2},
+        {'url': 'https://h/b', 'attempts': fetch.MAX_QUEUE_ATTEMPTS},
+        {'url': 'https://h/c', 'post_date': '01.02.2025', 'attempts': 2},
+    ])
+    assert saved == 2
+    assert fetch.load_retry_queue(path) == [
+        {'url': 'https://h/a', 'attempts': 1},
+        {'url': 'https://h/c', 'post_date': '01.02.2025', 'attempts': 2},
+    ]
+    assert not (tmp_path / 'queue.json.tmp').exists()
+
+
+def test_load_retry_queue_ignores_bad_files(tmp_path):
+    path = tmp_path / 'queue.json'
+    path.write_text('{not json', encoding='utf-8')
+    assert fetch.load_retry_queue(str(path)) == []
+    path.write_text(json.dumps([{'url': 'https://h/a'}, {'no': 'url'}, 'x']), encoding='utf-8')
+    assert fetch.load_retry_queue(str(path)) == [{'url': 'https://h/a'}]
+
+
+def scrape_each(outcomes):
+    """Returns a process callable that raises outcomes[url] if set, and the list of calls."""
+    calls = []
+
+    def process(entry):
+        calls.append(entry['url'])
+        if entry['url'] in outcomes:
+            raise outcomes[entry['url']]
+    return process, calls
+
+
+def test_queue_skips_listed_urls_that_are_queued():
+    process, calls = scrape_each({})
+    listed = [{'url': 'https://h/new'}, {'url': 'https://h/queued'}, {'url': 'https://h/seen'}]
+    queued = [{'url': 'https://h/queued', 'attempts': 1}]
+    seen = {'https://h/seen'}
+    failed = fetch.scrape_with_retry_queue(listed, queued, process, seen, delay=0)
+    assert calls == ['https://h/new', 'https://h/queued']
+    assert failed == []
+    assert seen == {'https://h/seen', 'https://h/new', 'https://h/queued'}
+
+
+def test_queue_increments_attempts_on_transient_failure():
+    down = requests.HTTPError(response=make_response(503))
+    process, calls = scrape_each({
+        'https://h/a': down,
+        'https://h/b': down,
+        'https://h/gone': requests.HTTPError(response=make_response(404)),
+    })
+    listed = [{'url': 'https://h/a', 'post_date': '01.02.2025'}, {'url': 'https://h/gone'}]
+    queued = [{'url': 'https://h/b', 'attempts': 2}]
+    failed = fetch.scrape_with_retry_queue(listed, queued, process, set(), delay=0)
+    assert failed == [
+        {'url': 'https://h/a', 'post_date': '01.02.2025', 'attempts': 1},
+        {'url': 'https://h/b', 'attempts': 3},
+    ]
+
+
+def test_queue_carries_entries_over_when_circuit_open():
+    for _ in range(fetch.BREAKER_THRESHOLD):
+        fetch.breaker.record_failure('h')
+    process, calls = scrape_each({})
+    queued = [{'url': 'https://h/a', 'attempts': 1}, {'url': 'https://other/b', 'attempts': 2}]
+    failed = fetch.scrape_with_retry_queue([], queued, process, set(), delay=0)
+    assert calls == ['https://other/b']
+    assert failed == [{'url': 'https://h/a', 'attempts': 1}]
@@ -0,0 +1,66 @@
+import csv
+import io
+
+import bench_final_html
+import final_html
+
+
+def make_row(**fields):
+    row = {'post_date': '2025-01-16', 'url': 'https://h/a', 'source': 'Moore'}
+    for lang in final_html.LANGS:
+        row[f'title_{lang}'] = f'Title {lang}'
+        row[f'content_{lang}'] = f'Content {lang}\nline two\n\nnext paragraph'
+    row.update(fields)
+    return row
+
+
+def test_special_characters_are_escaped():
+    card = final_html.make_card(make_row(
+        title_eng='1 < 2 & "x"',
+        content_eng='a < b & "c"\nnext',
+        source='Moore & <Co> "s.r.o."',
+        url='https://h/a?x=1&y="2"<',
+    ), 0)
+    assert '>1 &lt; 2 &amp; &quot;x&quot;</h2>' in card
+    assert 'a &lt; b &amp; &quot;c&quot;<br>next' in card
+    assert '>Moore &amp; &lt;Co&gt; &quot;s.r.o.&quot;</a>' in card
+    assert 'href="https://h/a?x=1&amp;y=&quot;2&quot;&lt;"' in card
+    assert '< 2' not in card and '"c"' not in card
+
+
+def test_preview_is_cut_on_raw_text():
+    content = 'a' * (final_html.PREVIEW_CHARS - 1) + '&b<c'
+    card = final_html.make_card(make_row(content_eng=content), 0)
+    summary = card.split('id="summary_eng_0" style="display:;">')[1].split('</p>')[0]
+    assert summary == 'a' * (final_html.PREVIEW_CHARS - 1) + '&amp;'
+    full = card.split('id="full_eng_0" style="display:none;">')[1].split('</p>')[0]
+    assert full == 'a' * (final_html.PREVIEW_CHARS - 1) + '&amp;b&lt;c'
+
+
+def test_short_content_preview_matches_full():
+    card = final_html.make_card(make_row(content_eng='short & sweet'), 0)
+    assert card.count('short &amp; sweet') == 2
+
+
+def test_short_csv_row_renders():
+    data = 'post_date,url,source,title_eng,content_eng\n2025-01-16,https://h/a\n'
+    rows = list(csv.DictReader(io.StringIO(data)))
+    assert rows[0]['title_eng'] is None
+    card = final_html.make_card(rows[0], 0)
+    assert '<p class="date">16.01.2025</p>' in card
+    assert 'href="https://h/a"' in card
+
+
+def test_line_breaks_match_baseline():
+    for text in ['', 'a', 'a\nb', 'a\n\nb', 'a\n\n\n\n\nb', '\n', '\n\n\n',
+                 'a\r\nb', 'a\r\n\r\nb', 'a\n\r\n\r\nb', 'a\r\n\n\nb']:
+        assert final_html.add_line_breaks(text) == bench_final_html.baseline_add_line_breaks(text)
+
+
+def test_plain_output_matches_baseline_renderer():
+    rows = [make_row(post_date=f'2025-01-{i + 1:02d}', url=f'https://h/{i}') for i in range(20)]
+    rows.append(make_row(content_eng='x' * 500 + '\n\n\n' + 'y' * 10))
+    new, old = io.StringIO(), io.StringIO()
+    final_html.write_html(iter(rows), new)
+    bench_final_html.baseline_write_html(iter(rows), old)
+    assert new.getvalue() == old.getvalue()